@@ -0,0 +1,182 @@
+import numpy as np
+
+from aircraft import AircraftLanding
+
+
+class ScheduleEvaluator:
+    """
+    Scores schedules of an aircraft landing problem independently of any solver.
+
+    The problem data is converted to arrays once, so the same evaluator can score many
+    candidate schedules (heuristics, neighbourhood moves, verification) cheaply.
+
+    Args:
+        aircraft_landing (AircraftLanding): The problem instance.
+        t_ir (List[List[int]], optional): Parking travel times overriding aircraft_landing.t_ir,
+            e.g. when read back from an exported result.
+    """
+
+    def __init__(self, aircraft_landing: AircraftLanding, t_ir=None):
+        landing_times = aircraft_landing.landing_times
+        self.n_aircraft = aircraft_landing.n_aircraft
+        self.n_runways = aircraft_landing.n_runways
+        self.earliest = np.array([lt.earliest for lt in landing_times], dtype=float)
+        self.target = np.array([lt.target for lt in landing_times], dtype=float)
+        self.latest = np.array([lt.latest for lt in landing_times], dtype=float)
+        self.penalty_before = np.array([lt.penalty_cost_before_target for lt in landing_times], dtype=float)
+        self.penalty_after = np.array([lt.penalty_cost_after_target for lt in landing_times], dtype=float)
+        self.t_ir = np.array(aircraft_landing.t_ir if t_ir is None else t_ir, dtype=float).reshape(self.n_aircraft, -1)
+
+        self.separation_times = np.array(aircraft_landing.separation_times, dtype=float)
+        if self.separation_times.shape != (self.n_aircraft, self.n_aircraft):
+            raise ValueError(f"Separation times must be a {self.n_aircraft}x{self.n_aircraft} matrix, "
+                             f"got shape {self.separation_times.shape}")
+        # The diagonal holds a large sentinel in the OR-Library data and is never used.
+        np.fill_diagonal(self.separation_times, 0.0)
+        self.max_separation = self.separation_times.max(initial=0.0)
+
+    def _as_times(self, landing_times):
+        times = np.asarray(landing_times, dtype=float)
+        if times.shape != (self.n_aircraft,):
+            raise ValueError(f"Expected {self.n_aircraft} landing times, got {times.size}")
+        not_finite = np.flatnonzero(~np.isfinite(times))
+        if not_finite.size:
+            raise ValueError(f"Landing times must be finite, got {times[not_finite[0]]} for aircraft {not_finite[0]}")
+        return times
+
+    def _as_arrays(self, landing_times, runway_assignments):
+        times = self._as_times(landing_times)
+        runways = np.asarray(runway_assignments, dtype=float)
+        if runways.shape != (self.n_aircraft,):
+            raise ValueError(f"Expected {self.n_aircraft} runway assignments, got {runways.size}")
+        not_integral = np.flatnonzero(~np.isfinite(runways) | (runways != np.round(runways)))
+        if not_integral.size:
+            raise ValueError(f"Runway assignments must be integers, got {runways[not_integral[0]]} "
+                             f"for aircraft {not_integral[0]}")
+        runways = runways.astype(np.int64)
+        if runways.size and (runways.min() < 0 or runways.max() >= self.n_runways):
+            raise ValueError(f"Runway assignments must lie in [0, {self.n_runways}), "
+                             f"got [{runways.min()}, {runways.max()}]")
+        return times, runways
+
+    def objectives(self, landing_times, runway_assignments):
+        """
+        Computes the objectives of problems 1, 2 and 3 for a schedule.
+
+        Args:
+            landing_times (array-like): Landing time of each aircraft.
+            runway_assignments (array-like): Runway index of each aircraft.
+
+        Returns:
+            dict: 'total_penalty', 'makespan' and 'lateness' of the schedule.
+        """
+        return self._objectives(*self._as_arrays(landing_times, runway_assignments))
+
+    def _objectives(self, times, runways):
+        early = np.maximum(self.target - times, 0.0)
+        late = np.maximum(times - self.target, 0.0)
+        parking = times + self.t_ir[np.arange(self.n_aircraft), runways] - self.target
+
+        return {
+            'total_penalty': float(self.penalty_before @ early + self.penalty_after @ late),
+            'makespan': float(times.max(initial=0.0)),
+            'lateness': float(np.maximum(parking, 0.0).sum())
+        }
+
+    def window_violations(self, landing_times, tolerance=1e-6):
+        """
+        Finds the aircraft landing outside their [earliest, latest] window.
+
+        Args:
+            landing_times (array-like): Landing time of each aircraft.
+            tolerance (float): Allowed slack on each bound.
+
+        Returns:
+            np.ndarray: Indices of the violating aircraft.
+        """
+        return self._window_violations(self._as_times(landing_times), tolerance)
+
+    def _window_violations(self, times, tolerance):
+        return np.flatnonzero((times < self.earliest - tolerance) | (times > self.latest + tolerance))
+
+    def separation_violations(self, landing_times, runway_assignments, tolerance=1e-6):
+        """
+        Finds the pairs of aircraft on the same runway landing too close to each other.
+
+        Aircraft are sorted by runway then landing time, and every aircraft is compared with
+        its d-th successor for d = 1, 2, ... (consecutive then transitive separations).
+        Offsets stop once no pair on a shared runway is closer than the largest separation.
+
+        Args:
+            landing_times (array-like): Landing time of each aircraft.
+            runway_assignments (array-like): Runway index of each aircraft.
+            tolerance (float): Allowed slack on each separation.
+
+        Returns:
+            np.ndarray: A (k, 2) array of (leading, trailing) aircraft index pairs.
+        """
+        times, runways = self._as_arrays(landing_times, runway_assignments)
+        return self._separation_violations(times, runways, tolerance)
+
+    def _separation_violations(self, times, runways, tolerance):
+        order = np.lexsort((times, runways))
+        sorted_times = times[order]
+        sorted_runways = runways[order]
+
+        violations = []
+        for offset in range(1, self.n_aircraft):
+            gap = sorted_times[offset:] - sorted_times[:-offset]
+            close = (sorted_runways[offset:] == sorted_runways[:-offset]) & (gap < self.max_separation + tolerance)
+            if not close.any():
+                break
+
+            leading = order[:-offset][close]
+            trailing = order[offset:][close]
+            gap = gap[close]
+            required = self.separation_times[leading, trailing]
+            # Simultaneous landings are feasible if either order satisfies the separation.
+            required = np.where(gap == 0, np.minimum(required, self.separation_times[trailing, leading]), required)
+            bad = gap < required - tolerance
+            if bad.any():
+                violations.append(np.column_stack((leading[bad], trailing[bad])))
+
+        if not violations:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(violations)
+
+    def evaluate(self, landing_times, runway_assignments, tolerance=1e-6):
+        """
+        Computes the objectives and every constraint violation of a schedule.
+
+        Args:
+            landing_times (array-like): Landing time of each aircraft.
+            runway_assignments (array-like): Runway index of each aircraft.
+            tolerance (float): Allowed slack on windows and separations.
+
+        Returns:
+            dict: The objectives (see objectives), plus 'window_violations',
+                'separation_violations' and 'feasible'.
+        """
+        times, runways = self._as_arrays(landing_times, runway_assignments)
+        result = self._objectives(times, runways)
+        result['window_violations'] = self._window_violations(times, tolerance)
+        result['separation_violations'] = self._separation_violations(times, runways, tolerance)
+        result['feasible'] = not result['window_violations'].size and not result['separation_violations'].size
+        return result
+
+
+def evaluate_schedule(aircraft_landing: AircraftLanding, landing_times, runway_assignments, tolerance=1e-6, t_ir=None):
+    """
+    Scores a single schedule. Use ScheduleEvaluator directly to score many schedules of one instance.
+
+    Args:
+        aircraft_landing (AircraftLanding): The problem instance.
+        landing_times (array-like): Landing time of each aircraft.
+        runway_assignments (array-like): Runway index of each aircraft.
+        tolerance (float): Allowed slack on windows and separations.
+        t_ir (List[List[int]], optional): Parking travel times overriding aircraft_landing.t_ir.
+
+    Returns:
+        dict: See ScheduleEvaluator.evaluate.
+    """
+    return ScheduleEvaluator(aircraft_landing, t_ir).evaluate(landing_times, runway_assignments, tolerance)
@@ -2,29 +2,27 @@ import csv
 import glob
 import json
 import os
+import queue
+import threading
 
 from mip import OptimizationStatus
 import re
 from tabulate import tabulate
 
 
-def export_solution_info_json(aircraft_landing_problem, status, model_variables, filename):
+def collect_solution_info(aircraft_landing_problem, status, model_variables):
     """
-    Export solution and problem information to a JSON file, including status messages when infeasible.
+    Collect solution and problem information into a JSON-serializable dictionary.
+
+    The solver values are read immediately, so the model can be discarded once this returns.
 
     Args:
         aircraft_landing_problem (AircraftLanding): Problem instance containing input data.
         status (OptimizationStatus): The solver status.
-        model_variables (dict): Dictionary containing variable lists:
-            - landing_times_decision
-            - early_penalty
-            - late_penalty
-            - makespan
-            - lateness
-            - total_penalty
-            - runway_assignment
-            - landing_order
-        filename (str): Output file path (without extension).
+        model_variables (dict): Dictionary containing variable lists, see export_solution_info_json.
+
+    Returns:
+        dict: The solution information.
     """
     data = {
         'status': status.name,
@@ -87,6 +85,18 @@ def export_solution_info_json(aircraft_landing_problem, status, model_variables,
     else:
         data['message'] = 'No feasible or optimal solution found.'
 
+    return data
+
+
+def write_solution_json(data, filename):
+    """
+    Write collected solution information to a JSON file with numeric lists kept on one line.
+    The file is written to a temporary file first and then atomically renamed.
+
+    Args:
+        data (dict): Solution information, as returned by collect_solution_info.
+        filename (str): Output file path (without extension).
+    """
     # Generate JSON string with indent
     json_str = json.dumps(data, indent=4)
 
@@ -102,13 +112,129 @@ def export_solution_info_json(aircraft_landing_problem, status, model_variables,
 
     json_str = pattern.sub(inline_lists, json_str)
 
-    # Write to JSON file
+    # Write to a temporary file next to the target, then rename it in place
     out_path = f"results/{filename}.json"
-    with open(out_path, 'w') as f:
-        f.write(json_str)
+    tmp_path = f"{out_path}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(json_str)
+        os.replace(tmp_path, out_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     print(f"Solution export completed: {out_path}")
 
 
+def export_solution_info_json(aircraft_landing_problem, status, model_variables, filename):
+    """
+    Export solution and problem information to a JSON file, including status messages when infeasible.
+
+    Args:
+        aircraft_landing_problem (AircraftLanding): Problem instance containing input data.
+        status (OptimizationStatus): The solver status.
+        model_variables (dict): Dictionary containing variable lists:
+            - landing_times_decision
+            - early_penalty
+            - late_penalty
+            - makespan
+            - lateness
+            - total_penalty
+            - runway_assignment
+            - landing_order
+        filename (str): Output file path (without extension).
+    """
+    write_solution_json(collect_solution_info(aircraft_landing_problem, status, model_variables), filename)
+
+
+class ResultWriter:
+    """
+    Writes collected solutions to JSON files from a background thread.
+
+    At most max_pending solutions wait in the queue; submit blocks when it is full,
+    so memory stays bounded when solving is faster than writing.
+    Errors raised while writing are re-raised as RuntimeError by the next submit, flush or close.
+    submit and flush raise RuntimeError once the writer is closed.
+
+    Args:
+        max_pending (int): Maximum number of solutions waiting to be written.
+    """
+
+    def __init__(self, max_pending: int = 4):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                write_solution_json(*item)
+            except Exception as e:
+                self._error = self._error or e
+            finally:
+                self._queue.task_done()
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("ResultWriter is closed")
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("Writing a solution failed") from self._error
+
+    def submit(self, data, filename):
+        """
+        Queue a solution for writing.
+
+        Args:
+            data (dict): Solution information, as returned by collect_solution_info.
+            filename (str): Output file path (without extension).
+        """
+        self._check_open()
+        self._raise_error()
+        self._queue.put((data, filename))
+
+    def flush(self):
+        """
+        Wait until every queued solution is written.
+        """
+        self._check_open()
+        self._queue.join()
+        self._raise_error()
+
+    def _stop(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def close(self):
+        """
+        Wait until every queued solution is written and stop the writer thread.
+        Closing an already closed writer does nothing.
+        """
+        if self._closed:
+            return
+        self._stop()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep the exception from the with body; a write error must not replace it.
+            self._stop()
+
+
 def summarize_all_results_to_csv(result_folder='results', problems=(1, 2, 3), output_file='summary.csv'):
     """
     Summarize structured solution results from multiple files in each problem folder and write to a CSV file.
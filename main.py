@@ -1,9 +1,11 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 from mip import Model, xsum, BINARY, CONTINUOUS, minimize
 from aircraft import AircraftLanding
 from data_fetcher import fetch_aircraft_data
-from export_result import export_solution_info_json, summarize_all_results_to_csv
+from export_result import (ResultWriter, collect_solution_info, export_solution_info_json,
+                           summarize_all_results_to_csv)
 
 
 def time_separation_constraint(model: Model, aircraft_landing: AircraftLanding, model_variables):
@@ -91,16 +93,15 @@ def separation_constraint(model: Model, aircraft_landing: AircraftLanding, model
 
     return model, runway_assignment, landing_order
 
-def problem_1(aircraft_landing: AircraftLanding, max_problem_time):
+def build_problem_1(aircraft_landing: AircraftLanding):
     """
-    Solves Problem 1: Minimize weighted deviation from target landing times.
+    Builds the model of Problem 1: Minimize weighted deviation from target landing times.
 
     Args:
         aircraft_landing (AircraftLanding): The problem instance.
-        max_problem_time (int): The maximum time to spend on each problem in seconds.
 
     Returns:
-        Tuple[str, dict]: The solver status and model variables.
+        Tuple[Model, dict]: The model and its variables.
     """
     model = Model("Minimize Weighted Deviation from Target Landing Times")
 
@@ -135,15 +136,13 @@ def problem_1(aircraft_landing: AircraftLanding, max_problem_time):
 
     model.objective = minimize(total_penalty)
 
-    status =  model.optimize(max_seconds=max_problem_time)
-
     model_variables = {"landing_times_decision": landing_times_decision, "early_penalty": early_penalty,
                        "late_penalty": late_penalty, "total_penalty": total_penalty, "runway_assignment": runway_assignment, "landing_order": landing_order}
-    return status, model_variables
+    return model, model_variables
 
-def problem_2(aircraft_landing: AircraftLanding, max_problem_time):
+def problem_1(aircraft_landing: AircraftLanding, max_problem_time):
     """
-    Solves Problem 2: Minimize the makespan (latest landing time).
+    Solves Problem 1: Minimize weighted deviation from target landing times.
 
     Args:
         aircraft_landing (AircraftLanding): The problem instance.
@@ -152,6 +151,20 @@ def problem_2(aircraft_landing: AircraftLanding, max_problem_time):
     Returns:
         Tuple[str, dict]: The solver status and model variables.
     """
+    model, model_variables = build_problem_1(aircraft_landing)
+    status = model.optimize(max_seconds=max_problem_time)
+    return status, model_variables
+
+def build_problem_2(aircraft_landing: AircraftLanding):
+    """
+    Builds the model of Problem 2: Minimize the makespan (latest landing time).
+
+    Args:
+        aircraft_landing (AircraftLanding): The problem instance.
+
+    Returns:
+        Tuple[Model, dict]: The model and its variables.
+    """
     model = Model("Minimizing Makespan")
 
     landing_times_decision = [model.add_var(var_type=CONTINUOUS, name=f"landing_time_{i}")
@@ -172,15 +185,13 @@ def problem_2(aircraft_landing: AircraftLanding, max_problem_time):
 
     model.objective = minimize(makespan)
 
-    status = model.optimize(max_seconds=max_problem_time)
-
     model_variables = {"landing_times_decision": landing_times_decision, "makespan": makespan,
                        "runway_assignment": runway_assignment, "landing_order": landing_order}
-    return status, model_variables
+    return model, model_variables
 
-def problem_3(aircraft_landing: AircraftLanding, max_problem_time):
+def problem_2(aircraft_landing: AircraftLanding, max_problem_time):
     """
-    Solves Problem 3: Minimize total lateness including parking delays.
+    Solves Problem 2: Minimize the makespan (latest landing time).
 
     Args:
         aircraft_landing (AircraftLanding): The problem instance.
@@ -189,6 +200,20 @@ def problem_3(aircraft_landing: AircraftLanding, max_problem_time):
     Returns:
         Tuple[str, dict]: The solver status and model variables.
     """
+    model, model_variables = build_problem_2(aircraft_landing)
+    status = model.optimize(max_seconds=max_problem_time)
+    return status, model_variables
+
+def build_problem_3(aircraft_landing: AircraftLanding):
+    """
+    Builds the model of Problem 3: Minimize total lateness including parking delays.
+
+    Args:
+        aircraft_landing (AircraftLanding): The problem instance.
+
+    Returns:
+        Tuple[Model, dict]: The model and its variables.
+    """
     model = Model("Minimizing Total Lateness with Runway Assignment")
 
     landing_times_decision = [model.add_var(var_type=CONTINUOUS, name=f"landing_time_{i}")
@@ -211,21 +236,65 @@ def problem_3(aircraft_landing: AircraftLanding, max_problem_time):
     a_i = [lt.target for lt in aircraft_landing.landing_times]
 
     for i in range(n_aircraft):
-        model += lateness[i] >= xsum(
-            landing_times_decision[i] + t_ir[i][r] * runway_assignment[i][r]
+        model += lateness[i] >= landing_times_decision[i] + xsum(
+            t_ir[i][r] * runway_assignment[i][r]
             for r in range(n_runways)
         ) - a_i[i]
 
     model.objective = minimize(xsum(lateness))
 
-    status = model.optimize(max_seconds=max_problem_time)
-
     model_variables = {"landing_times_decision": landing_times_decision, "lateness": xsum(lateness),
                        "runway_assignment": runway_assignment, "landing_order": landing_order}
+    return model, model_variables
+
+def problem_3(aircraft_landing: AircraftLanding, max_problem_time):
+    """
+    Solves Problem 3: Minimize total lateness including parking delays.
+
+    Args:
+        aircraft_landing (AircraftLanding): The problem instance.
+        max_problem_time (int): The maximum time to spend on each problem in seconds.
+
+    Returns:
+        Tuple[str, dict]: The solver status and model variables.
+    """
+    model, model_variables = build_problem_3(aircraft_landing)
+    status = model.optimize(max_seconds=max_problem_time)
     return status, model_variables
 
 data = fetch_aircraft_data()
 
+def run_pipelined(jobs, max_problem_time, max_pending=4):
+    """
+    Solves and exports a sequence of problems, overlapping each solve with the
+    construction of the next model and with the export of previous solutions.
+
+    The next model is built in a helper thread while the solver runs, and solutions are
+    written by a ResultWriter, so only the solves remain on the critical path.
+    The gain is bounded by the build and export time, which is small next to a time-limited solve.
+    At most one model is built ahead and at most max_pending solutions wait to be written.
+
+    Args:
+        jobs (List[Tuple[Callable, AircraftLanding, str]]): Model builder, problem instance
+            and output file name of each problem to solve.
+        max_problem_time (int): The maximum time to spend on each problem in seconds.
+        max_pending (int): Maximum number of solutions waiting to be written.
+    """
+    if not jobs:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as builder, ResultWriter(max_pending) as writer:
+        build, aircraft_landing, _ = jobs[0]
+        next_model = builder.submit(build, aircraft_landing)
+        for k, (_, aircraft_landing, filename) in enumerate(jobs):
+            model, model_variables = next_model.result()
+            if k + 1 < len(jobs):
+                next_build, next_aircraft_landing, _ = jobs[k + 1]
+                next_model = builder.submit(next_build, next_aircraft_landing)
+
+            status = model.optimize(max_seconds=max_problem_time)
+            writer.submit(collect_solution_info(aircraft_landing, status, model_variables), filename)
+
 def main():
     """
     Main entry point for solving aircraft landing problem optimization and exporting results.
@@ -235,6 +304,7 @@ def main():
     - n_runways: The number of runways to be used in the optimization problem.
     - n_files (optional): The number of files to check (default is 12, mainly use for fast unit testing).
     - max_time (optional): The maximum time to spend on each problem in seconds (default is 60).
+    - pipeline (optional): Overlap model construction and result export with the solves.
     """
 
     parser = argparse.ArgumentParser(description="Run aircraft landing problem optimization and export results.")
@@ -242,8 +312,19 @@ def main():
     parser.add_argument("n_runways", type=int, help="Number of runways for the optimization.")
     parser.add_argument("--n_files", type=int, default=12, help="Number of files to check (default is 12).")
     parser.add_argument("--max_time", type=int, default=60, help="Maximum time to spend on each problem in seconds (default is 60).")
+    parser.add_argument("--pipeline", action="store_true", help="Build the next model and export results in background threads while solving.")
     args = parser.parse_args()
 
+    if args.pipeline:
+        jobs = []
+        for i in range(min(args.n_files, 12)):
+            data[i].seed = args.seed
+            data[i].n_runways = args.n_runways
+            for problem, build in enumerate((build_problem_1, build_problem_2, build_problem_3), start=1):
+                jobs.append((build, data[i], f"problem{problem}/result_{i + 1}_{args.seed}_{args.n_runways}"))
+        run_pipelined(jobs, args.max_time)
+        return
+
     for i in range(min(args.n_files, 12)):
         data[i].seed = args.seed
         data[i].n_runways = args.n_runways
@@ -1,24 +1,183 @@
 import unittest
 import json
 import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
 
-class TestAllJsonOutputs(unittest.TestCase):
+import numpy as np
+
+from aircraft import AircraftLanding, LandingTime
+from evaluator import ScheduleEvaluator, evaluate_schedule
+import export_result
+from export_result import ResultWriter, write_solution_json
+
+# collect_solution_info rounds landing times and objectives to 2 decimals.
+ROUNDING_ERROR = 5e-3
+# A separation is the difference of two rounded landing times.
+FEASIBILITY_TOLERANCE = 2 * ROUNDING_ERROR
+# Relative slack for the solver's own tolerances.
+OBJECTIVE_TOLERANCE = 1e-4
+OBJECTIVE_KEYS = {1: 'total_penalty', 2: 'makespan', 3: 'lateness'}
+
+
+def aircraft_landing_from_json(aircraft_data):
+    """
+    Rebuilds the problem instance stored in the 'aircraft_data' field of a result.
+
+    Args:
+        aircraft_data (dict): The 'aircraft_data' field of a parsed result JSON.
+
+    Returns:
+        AircraftLanding: The problem instance.
+    """
+    landing_times = [LandingTime(**lt) for lt in aircraft_data['landing_times']]
+    return AircraftLanding(aircraft_data['n_aircraft'], aircraft_data['n_runways'], aircraft_data['freeze_time'],
+                           landing_times, aircraft_data['separation_times'])
+
+
+def objective_tolerance(problem, aircraft_data, value):
+    """
+    Bounds the difference between an objective recomputed from rounded landing times and the solver's value.
+
+    Rounding a landing time moves the objective by at most ROUNDING_ERROR times its slope:
+    the larger penalty cost of the aircraft for problem 1, 1 for problem 2 (the makespan moves
+    with a single landing time) and 1 per aircraft for problem 3.
+    The exported value is itself rounded, and the solver adds a relative OBJECTIVE_TOLERANCE.
+
+    Args:
+        problem (int): Problem number (1, 2 or 3).
+        aircraft_data (dict): The 'aircraft_data' field of a parsed result JSON.
+        value (float): The objective value compared against.
+
+    Returns:
+        float: The allowed absolute difference.
+    """
+    if problem == 1:
+        slope = sum(max(w['penalty_cost_before_target'], w['penalty_cost_after_target'])
+                    for w in aircraft_data['landing_times'])
+    elif problem == 2:
+        slope = 1
+    else:
+        slope = aircraft_data['n_aircraft']
+    return (slope + 1) * ROUNDING_ERROR + OBJECTIVE_TOLERANCE * max(1.0, abs(value))
+
+
+def check_result(problem, result):
+    """
+    Checks the time windows and the per runway separation of a result and recomputes its objective.
+
+    Args:
+        problem (int): Problem number (1, 2 or 3).
+        result (dict): Parsed result JSON.
+
+    Returns:
+        Tuple[List[str], float]: A description of every violated constraint, and the recomputed objective.
+    """
+    aircraft_data = result['aircraft_data']
+    runways = result['runway_assignments']
+    if None in runways:
+        return [f"Aircraft {runways.index(None)} has no runway"], None
+
+    landing_times = result['landing_times']
+    try:
+        evaluation = evaluate_schedule(aircraft_landing_from_json(aircraft_data), landing_times, runways,
+                                       FEASIBILITY_TOLERANCE, t_ir=aircraft_data['t_ir'])
+    except ValueError as e:
+        return [str(e)], None
+
+    windows = aircraft_data['landing_times']
+    separation_times = aircraft_data['separation_times']
+    errors = [f"Aircraft {i} lands at {landing_times[i]}, outside "
+              f"[{windows[i]['earliest']}, {windows[i]['latest']}]"
+              for i in evaluation['window_violations']]
+    errors += [f"Aircraft {i} and {j} on runway {runways[i]} are {landing_times[j] - landing_times[i]} apart, "
+               f"need {separation_times[i][j]}"
+               for i, j in evaluation['separation_violations']]
+    return errors, evaluation[OBJECTIVE_KEYS[problem]]
+
+
+def verify_result(ref_path, res_path, problem):
+    """
+    Verifies a result file against its reference: same instance and status, feasible schedule,
+    and an objective matching the reference within objective_tolerance.
+    Alternative optimal schedules are accepted.
+
+    Args:
+        ref_path (str): Path to the reference JSON file.
+        res_path (str): Path to the result JSON file.
+        problem (int): Problem number (1, 2 or 3), None if unknown.
+
+    Returns:
+        List[str]: A description of every failed check, empty if the result is valid.
+    """
+    if problem not in OBJECTIVE_KEYS:
+        return [f"Reference '{ref_path}' is not in a problem<N>/ directory for N in {sorted(OBJECTIVE_KEYS)}"]
+    if not os.path.exists(res_path):
+        return [f"Missing result file {res_path}"]
+
+    try:
+        with open(ref_path, "r") as f:
+            expected = json.load(f)
+        with open(res_path, "r") as f:
+            actual = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        return [f"Error reading or parsing file '{res_path}': {e}"]
 
-    def compare_json(self, expected, actual, path="root"):
-        if isinstance(expected, dict):
-            for key in expected:
-                self.assertIn(key, actual, f"Missing key '{path}.{key}'")
-                self.compare_json(expected[key], actual[key], f"{path}.{key}")
-            for key in actual:
-                self.assertIn(key, expected, f"Unexpected key '{path}.{key}'")
-        elif isinstance(expected, list):
-            self.assertEqual(len(expected), len(actual), f"List length mismatch at '{path}': expected {len(expected)}, got {len(actual)}")
-            for i, (e, a) in enumerate(zip(expected, actual)):
-                self.compare_json(e, a, f"{path}[{i}]")
-        elif isinstance(expected, float):
-            self.assertAlmostEqual(expected, actual, places=6, msg=f"Float mismatch at '{path}': expected {expected}, got {actual}")
-        else:
-            self.assertEqual(expected, actual, f"Value mismatch at '{path}': expected {expected}, got {actual}")
+    try:
+        if expected['aircraft_data'] != actual['aircraft_data']:
+            return ["Result was produced from different aircraft data than the reference"]
+        if expected['status'] != actual['status']:
+            return [f"Status mismatch: expected {expected['status']}, got {actual['status']}"]
+        if not expected['landing_times']:
+            return []
+
+        errors, objective = check_result(problem, actual)
+        if errors:
+            return errors
+
+        key = OBJECTIVE_KEYS[problem]
+        for source, value in (("reported", actual[key]), ("reference", expected[key])):
+            # Written so that a NaN objective or value fails the check.
+            if value is None or not abs(objective - value) <= objective_tolerance(problem, actual['aircraft_data'], value):
+                errors.append(f"Recomputed {key} {objective} does not match {source} value {value}")
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        return [f"Malformed result '{res_path}': {e!r}"]
+    return errors
+
+
+def verify_all_results(reference_dir, result_dir):
+    """
+    Verifies every result matching a reference JSON file, in parallel.
+
+    Args:
+        reference_dir (str): Directory holding the problem<N>/ reference subdirectories.
+        result_dir (str): Directory holding the matching result files.
+
+    Returns:
+        List[Tuple[str, List[str]]]: The path of each reference relative to reference_dir,
+            with the failed checks of its result.
+    """
+    rel_paths, ref_paths, res_paths, problems = [], [], [], []
+    for root, _, files in os.walk(reference_dir):
+        for filename in files:
+            if filename.endswith(".json"):
+                ref_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(ref_path, reference_dir)
+                rel_paths.append(rel_path)
+                ref_paths.append(ref_path)
+                res_paths.append(os.path.join(result_dir, rel_path))
+                problem = os.path.basename(root).removeprefix("problem")
+                problems.append(int(problem) if problem.isdigit() else None)
+
+    with ProcessPoolExecutor() as executor:
+        return list(zip(rel_paths, executor.map(verify_result, ref_paths, res_paths, problems, chunksize=16)))
+
+
+class TestAllJsonOutputs(unittest.TestCase):
 
     def test_all_json_files(self):
         reference_dir = "references"
@@ -27,22 +186,338 @@ class TestAllJsonOutputs(unittest.TestCase):
         self.assertTrue(os.path.isdir(reference_dir), f"Reference directory '{reference_dir}' does not exist")
         self.assertTrue(os.path.isdir(result_dir), f"Result directory '{result_dir}' does not exist")
 
-        for root, _, files in os.walk(reference_dir):
-            for filename in files:
-                if filename.endswith(".json"):
-                    ref_path = os.path.join(root, filename)
-                    rel_path = os.path.relpath(ref_path, reference_dir)
-                    res_path = os.path.join(result_dir, rel_path)
-
-                    with self.subTest(file=rel_path):
-                        self.assertTrue(os.path.exists(res_path), f"Missing result file for {rel_path}")
-
-                        try:
-                            with open(ref_path, "r") as f:
-                                expected = json.load(f)
-                            with open(res_path, "r") as f:
-                                actual = json.load(f)
-                        except (IOError, json.JSONDecodeError) as e:
-                            self.fail(f"Error reading or parsing file '{rel_path}': {e}")
-
-                        self.compare_json(expected, actual, path=rel_path)
+        for rel_path, errors in verify_all_results(reference_dir, result_dir):
+            with self.subTest(file=rel_path):
+                self.assertFalse(errors, "\n".join(errors))
+
+    def test_malformed_result_fails_only_its_own_file(self):
+        with tempfile.TemporaryDirectory() as result_dir:
+            shutil.copytree("references", result_dir, dirs_exist_ok=True)
+            broken_path = os.path.join(result_dir, "problem3", "result_1_36656565_1.json")
+            with open(broken_path) as f:
+                broken = json.load(f)
+            del broken['lateness']
+            with open(broken_path, 'w') as f:
+                json.dump(broken, f)
+
+            verdicts = dict(verify_all_results("references", result_dir))
+
+        self.assertEqual(len(verdicts), 3)
+        broken_rel_path = os.path.join("problem3", "result_1_36656565_1.json")
+        for rel_path, errors in verdicts.items():
+            with self.subTest(file=rel_path):
+                if rel_path == broken_rel_path:
+                    self.assertEqual(len(errors), 1)
+                    self.assertIn("Malformed result", errors[0])
+                    self.assertIn("lateness", errors[0])
+                else:
+                    self.assertEqual(errors, [])
+
+
+    def test_reference_outside_problem_directory_fails_only_its_own_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reference_dir = os.path.join(tmp_dir, "references")
+            shutil.copytree("references", reference_dir)
+            os.makedirs(os.path.join(reference_dir, "extra"))
+            for stray in ("stray.json", os.path.join("extra", "stray.json"), os.path.join("problem9", "stray.json")):
+                os.makedirs(os.path.dirname(os.path.join(reference_dir, stray)), exist_ok=True)
+                shutil.copy(os.path.join(reference_dir, "problem1", "result_1_36656565_1.json"),
+                            os.path.join(reference_dir, stray))
+
+            verdicts = dict(verify_all_results(reference_dir, "references"))
+
+        self.assertEqual(len(verdicts), 6)
+        for rel_path, errors in verdicts.items():
+            with self.subTest(file=rel_path):
+                if os.path.basename(rel_path) == "stray.json":
+                    self.assertEqual(len(errors), 1)
+                    self.assertIn("problem<N>", errors[0])
+                else:
+                    self.assertEqual(errors, [])
+
+    def test_non_finite_values_fail_verification(self):
+        reference_path = os.path.join("references", "problem1", "result_1_36656565_1.json")
+        with open(reference_path) as f:
+            reference = json.load(f)
+
+        for field, index in (('total_penalty', None), ('landing_times', 0)):
+            with self.subTest(field=field), tempfile.TemporaryDirectory() as result_dir:
+                result = json.loads(json.dumps(reference))
+                if index is None:
+                    result[field] = float('nan')
+                else:
+                    result[field][index] = float('nan')
+                result_path = os.path.join(result_dir, "result.json")
+                with open(result_path, 'w') as f:
+                    json.dump(result, f)
+
+                self.assertNotEqual(verify_result(reference_path, result_path, 1), [])
+
+
+    def test_objective_tolerance_covers_landing_time_rounding(self):
+        reference_path = os.path.join("references", "problem1", "result_1_36656565_1.json")
+        with open(reference_path) as f:
+            reference = json.load(f)
+
+        with tempfile.TemporaryDirectory() as result_dir:
+            result_path = os.path.join(result_dir, "result.json")
+
+            # Aircraft 9 lands on target with a penalty of 30: a shift within the rounding error
+            # changes the recomputed objective by 0.12, more than the relative tolerance on 700.
+            result = json.loads(json.dumps(reference))
+            result['landing_times'][9] += 0.004
+            with open(result_path, 'w') as f:
+                json.dump(result, f)
+            self.assertEqual(verify_result(reference_path, result_path, 1), [])
+
+            result['total_penalty'] += 10
+            with open(result_path, 'w') as f:
+                json.dump(result, f)
+            self.assertNotEqual(verify_result(reference_path, result_path, 1), [])
+
+
+class TestScheduleEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        landing_times = [LandingTime(0, 10, 20, 40, 1, 2),
+                         LandingTime(0, 10, 25, 40, 3, 4),
+                         LandingTime(0, 10, 30, 40, 5, 6)]
+        separation_times = [[99999, 5, 3],
+                            [5, 99999, 4],
+                            [3, 4, 99999]]
+        self.problem = AircraftLanding(3, 2, 0, landing_times, separation_times)
+        self.evaluator = ScheduleEvaluator(self.problem, t_ir=[[1, 2], [1, 2], [1, 2]])
+
+    def test_objectives(self):
+        objectives = self.evaluator.objectives([18, 27, 30], [0, 1, 0])
+        self.assertAlmostEqual(objectives['total_penalty'], 1 * 2 + 4 * 2)
+        self.assertAlmostEqual(objectives['makespan'], 30)
+        self.assertAlmostEqual(objectives['lateness'], 0 + 4 + 1)
+
+    def test_feasible_schedule(self):
+        evaluation = self.evaluator.evaluate([20, 25, 30], [0, 0, 1])
+        self.assertTrue(evaluation['feasible'])
+
+    def test_consecutive_and_transitive_separation(self):
+        # 1 follows 0 closely enough, but 2 is too close to 0 two positions earlier.
+        violations = self.evaluator.separation_violations([20, 25, 22.5], [0, 0, 0])
+        self.assertEqual(sorted(map(tuple, violations.tolist())), [(0, 2), (2, 1)])
+        violations = self.evaluator.separation_violations([20, 26, 22], [0, 0, 0])
+        self.assertEqual(violations.tolist(), [[0, 2]])
+
+    def test_window_violations(self):
+        evaluation = self.evaluator.evaluate([5, 25, 41], [0, 1, 1])
+        self.assertEqual(evaluation['window_violations'].tolist(), [0, 2])
+        self.assertFalse(evaluation['feasible'])
+
+    def test_invalid_schedule_shapes(self):
+        with self.assertRaises(ValueError):
+            self.evaluator.window_violations([20, 25])
+        with self.assertRaises(ValueError):
+            self.evaluator.evaluate([20, 25, 30], [0, 0])
+        with self.assertRaises(ValueError):
+            self.evaluator.evaluate([20, 25, 30], [0, 0, 2])
+
+    def test_non_finite_landing_times(self):
+        for bad in (np.nan, np.inf, -np.inf):
+            with self.subTest(bad=bad):
+                with self.assertRaises(ValueError):
+                    self.evaluator.evaluate([bad, 25, 30], [0, 0, 1])
+                with self.assertRaises(ValueError):
+                    self.evaluator.window_violations([bad, 25, 30])
+
+    def test_non_integral_runways(self):
+        for runways in ([0.9, 0.2, 1], [0, np.nan, 1], [0, np.inf, 1], [0, None, 1]):
+            with self.subTest(runways=runways):
+                with self.assertRaises(ValueError):
+                    self.evaluator.evaluate([20, 25, 30], runways)
+        evaluation = self.evaluator.evaluate([20, 25, 30], [0.0, 0.0, 1.0])
+        self.assertTrue(evaluation['feasible'])
+
+    def test_evaluate_schedule_uses_t_ir_override(self):
+        evaluation = evaluate_schedule(self.problem, [20, 25, 30], [0, 1, 1], t_ir=[[1, 2], [1, 2], [1, 2]])
+        self.assertAlmostEqual(evaluation['lateness'], 1 + 2 + 2)
+
+    def test_large_random_schedule_matches_pairwise_check(self):
+        rng = np.random.default_rng(0)
+        n = 300
+        landing_times = [LandingTime(0, 0, 500, 1000, 1, 1) for _ in range(n)]
+        separation_times = rng.integers(1, 10, size=(n, n)).tolist()
+        problem = AircraftLanding(n, 3, 0, landing_times, separation_times)
+        evaluator = ScheduleEvaluator(problem, t_ir=np.ones((n, 3)).tolist())
+        times = rng.integers(0, 1000, size=n)
+        runways = rng.integers(0, 3, size=n)
+
+        expected = set()
+        for i in range(n):
+            for j in range(n):
+                if i != j and runways[i] == runways[j] and times[i] <= times[j]:
+                    gap = times[j] - times[i]
+                    required = separation_times[i][j]
+                    if gap == 0:
+                        required = min(required, separation_times[j][i])
+                    if gap < required and (gap > 0 or i < j):
+                        expected.add((i, j))
+
+        actual = set(map(tuple, evaluator.separation_violations(times, runways).tolist()))
+        self.assertEqual(actual, expected)
+
+
+@contextmanager
+def in_temporary_results_dir():
+    """
+    Runs the enclosed block from a temporary directory holding empty results/problem<N>/ folders.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for problem in OBJECTIVE_KEYS:
+            os.makedirs(os.path.join(tmp_dir, "results", f"problem{problem}"))
+        os.chdir(tmp_dir)
+        try:
+            yield tmp_dir
+        finally:
+            os.chdir(cwd)
+
+
+def import_main():
+    """
+    Imports main without fetching the datasets, which it otherwise does on import.
+    """
+    with mock.patch("data_fetcher.fetch_aircraft_data", return_value=[]):
+        import main
+    return main
+
+
+def reference_aircraft_landing(n_runways):
+    """
+    Rebuilds the reference instance (OR-Library airland1, seed 36656565) with the given number of runways.
+    """
+    reference_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "references", "problem1", "result_1_36656565_1.json")
+    with open(reference_path) as f:
+        aircraft_landing = aircraft_landing_from_json(json.load(f)['aircraft_data'])
+    aircraft_landing.seed = 36656565
+    aircraft_landing.n_runways = n_runways
+    return aircraft_landing
+
+
+class TestProblemModels(unittest.TestCase):
+
+    def test_problem_3_lateness_matches_evaluator_on_several_runways(self):
+        main = import_main()
+        for n_runways in (1, 2, 3):
+            with self.subTest(n_runways=n_runways), in_temporary_results_dir() as tmp_dir:
+                aircraft_landing = reference_aircraft_landing(n_runways)
+                status, model_variables = main.problem_3(aircraft_landing, 20)
+                export_result.export_solution_info_json(aircraft_landing, status, model_variables, "problem3/result")
+
+                result_path = os.path.join(tmp_dir, "results", "problem3", "result.json")
+                self.assertEqual(verify_result(result_path, result_path, 3), [])
+
+
+class TestResultExport(unittest.TestCase):
+
+    def setUp(self):
+        self.reference_dir = os.path.abspath("references")
+
+    def reference_path(self, problem):
+        return os.path.join(self.reference_dir, f"problem{problem}", "result_1_36656565_1.json")
+
+    def test_write_solution_json_matches_previous_export(self):
+        # The references were written by the original export_solution_info_json.
+        with in_temporary_results_dir():
+            for problem in OBJECTIVE_KEYS:
+                with self.subTest(problem=problem):
+                    with open(self.reference_path(problem)) as f:
+                        expected = f.read()
+                    write_solution_json(json.loads(expected), f"problem{problem}/result")
+                    with open(f"results/problem{problem}/result.json") as f:
+                        self.assertEqual(f.read(), expected)
+                    self.assertEqual(os.listdir(f"results/problem{problem}"), ["result.json"])
+
+    def test_failed_write_removes_temporary_file(self):
+        with in_temporary_results_dir():
+            with mock.patch("export_result.os.replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    write_solution_json({'status': 'OPTIMAL'}, "problem1/result")
+            self.assertEqual(os.listdir("results/problem1"), [])
+
+    def test_writer_reports_failed_write(self):
+        with in_temporary_results_dir():
+            writer = ResultWriter()
+            writer.submit({'status': 'OPTIMAL'}, "missing_dir/result")
+            with self.assertRaises(RuntimeError):
+                writer.flush()
+            with self.assertRaises(RuntimeError):
+                writer.submit({'status': 'OPTIMAL'}, "problem1/result")
+            with self.assertRaises(RuntimeError):
+                writer.close()
+
+    def test_writer_rejects_use_after_close(self):
+        with mock.patch("export_result.write_solution_json") as write:
+            writer = ResultWriter(max_pending=1)
+            writer.close()
+            with self.assertRaises(RuntimeError):
+                writer.submit({}, "problem1/result")
+            with self.assertRaises(RuntimeError):
+                writer.flush()
+            writer.close()
+            write.assert_not_called()
+
+    def test_writer_keeps_exception_from_with_body(self):
+        with in_temporary_results_dir():
+            with self.assertRaises(ValueError):
+                with ResultWriter() as writer:
+                    writer.submit({'status': 'OPTIMAL'}, "missing_dir/result")
+                    raise ValueError("solver failed")
+
+    def test_writer_submit_blocks_when_queue_is_full(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_write(data, filename):
+            started.set()
+            release.wait()
+
+        with mock.patch("export_result.write_solution_json", side_effect=slow_write):
+            writer = ResultWriter(max_pending=1)
+            writer.submit({}, "first")
+            self.assertTrue(started.wait(5))
+            writer.submit({}, "second")
+
+            blocked = threading.Thread(target=writer.submit, args=({}, "third"))
+            blocked.start()
+            blocked.join(0.2)
+            self.assertTrue(blocked.is_alive())
+
+            release.set()
+            blocked.join(5)
+            self.assertFalse(blocked.is_alive())
+            writer.close()
+            self.assertEqual(export_result.write_solution_json.call_count, 3)
+
+    def test_pipelined_run_matches_sequential_run(self):
+        main = import_main()
+        builders = {1: main.build_problem_1, 2: main.build_problem_2, 3: main.build_problem_3}
+        solvers = {1: main.problem_1, 2: main.problem_2, 3: main.problem_3}
+
+        for n_runways in (1, 2, 3):
+            aircraft_landing = reference_aircraft_landing(n_runways)
+            with in_temporary_results_dir() as sequential_dir:
+                for problem, solve in solvers.items():
+                    status, model_variables = solve(aircraft_landing, 20)
+                    export_result.export_solution_info_json(aircraft_landing, status, model_variables,
+                                                            f"problem{problem}/result")
+
+                with in_temporary_results_dir() as pipelined_dir:
+                    main.run_pipelined([(build, aircraft_landing, f"problem{problem}/result")
+                                        for problem, build in builders.items()], 20)
+
+                    for problem in OBJECTIVE_KEYS:
+                        with self.subTest(n_runways=n_runways, problem=problem):
+                            self.assertEqual(os.listdir(os.path.join(pipelined_dir, "results", f"problem{problem}")),
+                                             ["result.json"])
+                            # Alternative optima are allowed, so compare feasibility and objective only.
+                            errors = verify_result(os.path.join(sequential_dir, "results", f"problem{problem}", "result.json"),
+                                                   os.path.join(pipelined_dir, "results", f"problem{problem}", "result.json"),
+                                                   problem)
+                            self.assertEqual(errors, [])